@@ -1,6 +1,16 @@
+import atexit
 import os
 import datetime
 
+# Hooks are short-lived processes, so the debug flag is read once at import
+_DEBUG_ENABLED = os.getenv('HANDSOFF_DEBUG', '0').lower() not in ['0', 'false', 'off', 'disable']
+
+# Buffered handle for hook-debug.log, opened on first use and flushed at exit
+_LOG_FH = None
+
+# Set once the hooked-sessions directory has been created in this process
+_SESSION_DIR_READY = False
+
 
 def _session_dir():
     """Get session directory path using AGENTIZE_HOME fallback."""
@@ -14,24 +24,35 @@ def _tmp_dir():
     return os.path.join(base, '.tmp')
 
 
+def _log_fh():
+    """Open the buffered hook-debug.log handle once per process."""
+    global _LOG_FH
+    if _LOG_FH is None:
+        tmp_dir = _tmp_dir()
+        os.makedirs(tmp_dir, exist_ok=True)
+        _LOG_FH = open(os.path.join(tmp_dir, 'hook-debug.log'), 'a', buffering=65536)
+        atexit.register(_LOG_FH.close)
+    return _LOG_FH
+
+
 def logger(sid, msg):
-    if os.getenv('HANDSOFF_DEBUG', '0').lower() in ['0', 'false', 'off', 'disable']:
+    if not _DEBUG_ENABLED:
         return
-    tmp_dir = _tmp_dir()
-    os.makedirs(tmp_dir, exist_ok=True)
-    log_path = os.path.join(tmp_dir, 'hook-debug.log')
-    with open(log_path, 'a') as log_file:
-        time = datetime.datetime.now().isoformat()
-        log_file.write(f"[{time}] [{sid}] {msg}\n")
+    time = datetime.datetime.now().isoformat()
+    _log_fh().write(f"[{time}] [{sid}] {msg}\n")
 
 
 def log_tool_decision(session, context, tool, target, decision):
     # Log all Haiku decisions and errors to tool-haiku-determined.txt
-    if os.getenv('HANDSOFF_DEBUG', '0').lower() in ['0', 'false', 'off', 'disable']:
+    if not _DEBUG_ENABLED:
         return
+    global _SESSION_DIR_READY
     session_dir = _session_dir()
-    os.makedirs(session_dir, exist_ok=True)
+    if not _SESSION_DIR_READY:
+        os.makedirs(session_dir, exist_ok=True)
+        _SESSION_DIR_READY = True
     time = datetime.datetime.now().isoformat()
+    # Written through immediately: determine.py appends to the same file
     log_path = os.path.join(session_dir, 'tool-haiku-determined.txt')
     with open(log_path, 'a') as f:
-        f.write(f'[{time}] [{session}] {tool} | {target} => {decision}\n')
\ No newline at end of file
+        f.write(f'[{time}] [{session}] {tool} | {target} => {decision}\n')
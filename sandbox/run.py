@@ -22,18 +22,22 @@ Container runtime is detected in priority order:
 """
 
 import argparse
+import functools
 import hashlib
-import json
 import os
+import pickle
 import platform
-import shlex
+import re
 import shutil
 import sqlite3
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 # Python 3.11+ has tomllib built-in, older versions need tomli
 if sys.version_info >= (3, 11):
@@ -41,9 +45,21 @@ if sys.version_info >= (3, 11):
 else:
     import tomli as tomllib
 
-# Cache file to store image hash for rebuild detection
-CACHE_DIR = Path.home() / ".cache" / "agentize"
-CACHE_FILE = CACHE_DIR / "sandbox-image.json"
+# Directory containing this script (also the image build context)
+SCRIPT_DIR = Path(__file__).parent.resolve()
+
+# Resolved once; Path.home() may consult the passwd database on each call
+HOME_DIR = Path.home()
+
+# Cache file to store image hash for rebuild detection: the hash on the first
+# line, then one "mtime_ns<TAB>size<TAB>path" line per trigger file
+CACHE_DIR = HOME_DIR / ".cache" / "agentize"
+CACHE_FILE = CACHE_DIR / "sandbox-image.txt"
+# JSON cache written by older versions; removed, never read
+LEGACY_CACHE_FILE = CACHE_DIR / "sandbox-image.json"
+
+# Parsed TOML configs, persisted across runs when AGENTIZE_FAST_CONFIG=1
+CONFIG_CACHE_FILE = CACHE_DIR / "config-cache.pkl"
 
 IMAGE_NAME = "agentize-sandbox"
 
@@ -54,12 +70,47 @@ BUILD_TRIGGER_FILES = [
     "entrypoint.sh",
 ]
 
+# Read buffer size used when hashing build trigger files
+HASH_CHUNK_SIZE = 64 * 1024
+
 # Container naming prefix
 CONTAINER_PREFIX = "agentize-sb-"
 
-# Work directory name (for shallow clones)
+# Full container ID as printed by `run -d`, matched on its own line so stray
+# runtime messages on stdout are ignored
+CONTAINER_ID_RE = re.compile(r"^([0-9a-f]{64})\s*$", re.MULTILINE)
+
+# Maximum number of containers torn down concurrently by reset
+RESET_WORKERS = 8
+
+# Host credential files mounted read-only into the container when present:
+# (host path, container path)
+CREDENTIAL_MOUNTS = [
+    # CCR config
+    (HOME_DIR / ".claude-code-router" / "config.json",
+     "/home/agentizer/.claude-code-router/config.json"),
+    (HOME_DIR / ".claude-code-router" / "config.json",
+     "/home/agentizer/.claude-code-router/config-router.json"),
+    # GitHub CLI credentials
+    (HOME_DIR / ".config" / "gh" / "config.yml",
+     "/home/agentizer/.config/gh/config.yml"),
+    (HOME_DIR / ".config" / "gh" / "hosts.yml",
+     "/home/agentizer/.config/gh/hosts.yml"),
+    # Git credentials
+    (HOME_DIR / ".git-credentials", "/home/agentizer/.git-credentials"),
+    (HOME_DIR / ".gitconfig", "/home/agentizer/.gitconfig"),
+]
+
+# Work directory name (holds one clone per sandbox)
 WORK_DIR = ".work"
 
+# Column layout of the `ls` table (NAME, BRANCH, CONTAINER, STATUS, CREATED)
+LS_ROW_FORMAT = "{:<15} {:<20} {:<12} {:<10} {}".format
+
+# Clone retry policy for sandbox work directories
+CLONE_ATTEMPTS = 3
+CLONE_TIMEOUT = 300  # seconds per attempt
+
 # Database file name
 DB_FILE = ".sandbox_db.sqlite"
 
@@ -74,82 +125,194 @@ class SandboxDB:
 
     def __init__(self, repo_base: Path):
         self.db_path = repo_base / DB_FILE
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
         self._init_db()
 
     def _init_db(self):
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS sandboxes (
-                    name TEXT PRIMARY KEY,
-                    branch TEXT NOT NULL,
-                    container_id TEXT,
-                    work_dir TEXT NOT NULL,
-                    ccr_mode INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-8000")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sandboxes (
+                name TEXT PRIMARY KEY,
+                branch TEXT NOT NULL,
+                container_id TEXT,
+                work_dir TEXT NOT NULL,
+                ccr_mode INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                container_name TEXT,
+                state TEXT DEFAULT 'unknown'
+            )
+        """)
+
+        # Migrate databases created before these columns existed
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(sandboxes)")}
+        if "container_name" not in columns:
+            with self.batch():
+                self.conn.execute("ALTER TABLE sandboxes ADD COLUMN container_name TEXT")
+                self.conn.execute(
+                    "UPDATE sandboxes SET container_name = ? || name",
+                    (CONTAINER_PREFIX,),
                 )
-            """)
-            conn.commit()
+        if "state" not in columns:
+            self.conn.execute("ALTER TABLE sandboxes ADD COLUMN state TEXT DEFAULT 'unknown'")
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self.conn.close()
 
-    def create(self, name: str, branch: str, work_dir: str, ccr_mode: bool = False) -> None:
+    @contextmanager
+    def batch(self):
+        """Group several mutations into a single transaction."""
+        self.conn.execute("BEGIN")
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def create(
+        self,
+        name: str,
+        branch: str,
+        work_dir: str,
+        ccr_mode: bool = False,
+        container_id: Optional[str] = None,
+        container_name: Optional[str] = None,
+        state: str = "unknown",
+    ) -> None:
         """Create a new sandbox record."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """INSERT INTO sandboxes (name, branch, work_dir, ccr_mode)
-                   VALUES (?, ?, ?, ?)""",
-                (name, branch, work_dir, 1 if ccr_mode else 0),
-            )
-            conn.commit()
+        self.conn.execute(
+            """INSERT INTO sandboxes
+                   (name, branch, work_dir, ccr_mode, container_id, container_name, state)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (
+                name,
+                branch,
+                work_dir,
+                1 if ccr_mode else 0,
+                container_id,
+                container_name or get_container_name(name),
+                state,
+            ),
+        )
 
     def update_container_id(self, name: str, container_id: str) -> None:
         """Update container ID for a sandbox."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """UPDATE sandboxes SET container_id = ?, updated_at = ?
-                   WHERE name = ?""",
-                (container_id, datetime.now().isoformat(), name),
-            )
-            conn.commit()
+        self.conn.execute(
+            """UPDATE sandboxes SET container_id = ?, updated_at = ?
+               WHERE name = ?""",
+            (container_id, datetime.now().isoformat(), name),
+        )
+
+    def update_state(self, name: str, state: str) -> None:
+        """Record the last observed container state (running/stopped/unknown)."""
+        self.conn.execute(
+            """UPDATE sandboxes SET state = ?, updated_at = ?
+               WHERE name = ?""",
+            (state, datetime.now().isoformat(), name),
+        )
 
     def get(self, name: str) -> Optional[dict]:
         """Get sandbox by name."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("SELECT * FROM sandboxes WHERE name = ?", (name,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+        cursor = self.conn.execute("SELECT * FROM sandboxes WHERE name = ?", (name,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
 
     def list_all(self) -> list[dict]:
         """List all sandboxes."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("SELECT * FROM sandboxes ORDER BY created_at DESC")
-            return [dict(row) for row in cursor.fetchall()]
+        cursor = self.conn.execute("SELECT * FROM sandboxes ORDER BY created_at DESC")
+        return [dict(row) for row in cursor.fetchall()]
+
+    def list_all_json(self) -> str:
+        """List all sandboxes as a JSON array, serialized by SQLite."""
+        cursor = self.conn.execute(
+            """SELECT json_group_array(json_object(
+                   'name', name,
+                   'branch', branch,
+                   'container_id', container_id,
+                   'work_dir', work_dir,
+                   'ccr_mode', ccr_mode,
+                   'created_at', created_at,
+                   'updated_at', updated_at,
+                   'container_name', COALESCE(container_name, ? || name),
+                   'last_known_state', state))
+               FROM (SELECT * FROM sandboxes ORDER BY created_at DESC)""",
+            (CONTAINER_PREFIX,),
+        )
+        return cursor.fetchone()[0]
 
     def delete(self, name: str) -> None:
         """Delete a sandbox record."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM sandboxes WHERE name = ?", (name,))
-            conn.commit()
+        self.conn.execute("DELETE FROM sandboxes WHERE name = ?", (name,))
 
     def get_next_counter(self) -> int:
         """Get the next available counter for auto-naming (cnt_N)."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT name FROM sandboxes WHERE name LIKE 'cnt_%'"
-            )
-            max_counter = 0
-            for row in cursor.fetchall():
-                name = row[0]
-                try:
-                    counter = int(name.replace("cnt_", ""))
-                    max_counter = max(max_counter, counter)
-                except ValueError:
-                    pass
-            return max_counter + 1
+        # The GLOB prefix is served by the primary key index; the second
+        # GLOB skips names like cnt_foo that have a non-numeric suffix.
+        cursor = self.conn.execute(
+            """SELECT COALESCE(MAX(CAST(substr(name, 5) AS INTEGER)), 0) + 1
+               FROM sandboxes
+               WHERE name GLOB 'cnt_[0-9]*'
+                 AND substr(name, 5) NOT GLOB '*[^0-9]*'"""
+        )
+        return cursor.fetchone()[0]
 
 
+def read_config_cache() -> dict:
+    """Read the persisted TOML parse cache: {path: (mtime_ns, size, config)}."""
+    try:
+        with open(CONFIG_CACHE_FILE, "rb") as f:
+            cache = pickle.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except Exception:
+        return {}
+
+
+def write_config_cache(cache: dict) -> None:
+    """Atomically persist the TOML parse cache."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = CONFIG_CACHE_FILE.with_name(f"{CONFIG_CACHE_FILE.name}.{os.getpid()}")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cache, f)
+        os.replace(tmp_path, CONFIG_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def load_toml_config(config_path: Path, cache: Optional[dict] = None) -> Optional[dict]:
+    """Parse a TOML config file, returning None if it is missing or invalid."""
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        return None
+
+    # Reuse a parse from the cache while the file's mtime and size match
+    key = str(config_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    if cache is not None:
+        entry = cache.get(key)
+        if entry and entry[:2] == stamp:
+            return entry[2]
+
+    try:
+        with open(config_path, "rb") as f:
+            config = tomllib.load(f)
+    except Exception:
+        return None
+
+    if cache is not None:
+        cache[key] = (*stamp, config)
+    return config
+
+
+@functools.lru_cache(maxsize=1)
 def get_container_runtime() -> str:
     """Determine the container runtime to use.
 
@@ -161,31 +324,27 @@ def get_container_runtime() -> str:
     5. Default to docker
     """
     # Priority 1: Local config file
-    script_dir = Path(__file__).parent.resolve()
     local_configs = [
-        script_dir / "agentize.toml",
-        script_dir.parent / "agentize.toml",
+        SCRIPT_DIR / "agentize.toml",
+        SCRIPT_DIR.parent / "agentize.toml",
     ]
-    for config_path in local_configs:
-        if config_path.exists():
-            try:
-                with open(config_path, "rb") as f:
-                    config = tomllib.load(f)
-                if "container" in config and "runtime" in config["container"]:
-                    return config["container"]["runtime"]
-            except Exception:
-                pass
-
     # Priority 2: Global config file
-    config_path = Path.home() / ".config" / "agentize" / "agentize.toml"
-    if config_path.exists():
-        try:
-            with open(config_path, "rb") as f:
-                config = tomllib.load(f)
-            if "container" in config and "runtime" in config["container"]:
-                return config["container"]["runtime"]
-        except Exception:
-            pass
+    global_config = HOME_DIR / ".config" / "agentize" / "agentize.toml"
+
+    # With AGENTIZE_FAST_CONFIG=1, parsed configs persist across runs
+    cache = None
+    if os.environ.get("AGENTIZE_FAST_CONFIG") == "1":
+        cache = read_config_cache()
+        cached = dict(cache)
+
+    try:
+        for config_path in [*local_configs, global_config]:
+            container = (load_toml_config(config_path, cache) or {}).get("container")
+            if isinstance(container, dict) and "runtime" in container:
+                return container["runtime"]
+    finally:
+        if cache is not None and cache != cached:
+            write_config_cache(cache)
 
     # Priority 3: Environment variable
     runtime = os.environ.get("CONTAINER_RUNTIME")
@@ -200,6 +359,7 @@ def get_container_runtime() -> str:
     return "docker"
 
 
+@functools.lru_cache(maxsize=1)
 def get_host_architecture() -> str:
     """Map platform.machine() to standard architecture names."""
     arch = platform.machine().lower()
@@ -220,41 +380,82 @@ def is_interactive() -> bool:
     return sys.stdin.isatty() and sys.stdout.isatty()
 
 
-def calculate_files_hash(files: list[Path]) -> str:
-    """Calculate a hash of the contents of the given files."""
+def calculate_files_hash(files: Iterable[Path]) -> str:
+    """Calculate an order-independent hash of the names and contents of files."""
     hasher = hashlib.sha256()
-    for file_path in files:
-        if file_path.exists():
-            with open(file_path, "rb") as f:
-                hasher.update(f.read())
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    for file_path in sorted(files, key=lambda p: p.name):
+        try:
+            with open(file_path, "rb", buffering=0) as f:
+                hasher.update(file_path.name.encode() + b"\0")
+                while n := f.readinto(buf):
+                    hasher.update(view[:n])
+        except FileNotFoundError:
+            continue
     return hasher.hexdigest()
 
 
-def get_image_hash() -> Optional[str]:
-    """Get the cached image hash."""
-    if CACHE_FILE.exists():
+def get_files_signature(files: Iterable[Path]) -> list[list]:
+    """Get a cheap (path, mtime_ns, size) signature of the given files."""
+    signature = []
+    for file_path in files:
         try:
-            with open(CACHE_FILE) as f:
-                data = json.load(f)
-            return data.get("hash")
-        except Exception:
-            pass
-    return None
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            continue
+        signature.append([str(file_path), st.st_mtime_ns, st.st_size])
+    return signature
 
 
-def save_image_hash(image_hash: str) -> None:
-    """Save the image hash to cache."""
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    with open(CACHE_FILE, "w") as f:
-        json.dump({"hash": image_hash}, f)
+@functools.lru_cache(maxsize=1)
+def get_image_cache() -> dict:
+    """Get the cached image hash and trigger file signature."""
+    try:
+        lines = CACHE_FILE.read_text().splitlines()
+    except OSError:
+        return {}
+
+    image_hash = lines[0].strip() if lines else ""
+    if not image_hash:
+        return {}
+    try:
+        signature = []
+        for line in lines[1:]:
+            mtime_ns, size, path = line.split("\t", 2)
+            signature.append([path, int(mtime_ns), int(size)])
+    except ValueError:
+        return {"hash": image_hash}
+    return {"hash": image_hash, "sig": signature}
+
+
+def get_image_hash() -> Optional[str]:
+    """Get the cached image hash."""
+    return get_image_cache().get("hash")
 
 
+def save_image_hash(image_hash: str, signature: Optional[list[list]] = None) -> None:
+    """Save the image hash, and optionally the trigger file signature, to cache."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    lines = [image_hash]
+    for path, mtime_ns, size in signature or []:
+        lines.append(f"{mtime_ns}\t{size}\t{path}")
+    # Write then rename so a concurrent reader never sees a partial file
+    tmp_path = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}")
+    tmp_path.write_text("\n".join(lines) + "\n")
+    os.replace(tmp_path, CACHE_FILE)
+    LEGACY_CACHE_FILE.unlink(missing_ok=True)
+    get_image_cache.cache_clear()
+
+
+@functools.lru_cache(maxsize=8)
 def image_exists(runtime: str, image_name: str) -> bool:
     """Check if the container image exists."""
     try:
         subprocess.run(
             [runtime, "image", "inspect", image_name],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             check=True,
         )
         return True
@@ -270,12 +471,19 @@ def build_image(runtime: str, image_name: str, context: Path) -> bool:
             [runtime, "build", "-t", image_name, str(context)],
             check=True,
         )
+        image_exists.cache_clear()
         return True
     except subprocess.CalledProcessError as e:
         print(f"Failed to build image: {e}", file=sys.stderr)
         return False
 
 
+@functools.lru_cache(maxsize=4)
+def get_trigger_paths(context: Path) -> tuple[Path, ...]:
+    """Get the build trigger file paths for a build context."""
+    return tuple(context / f for f in BUILD_TRIGGER_FILES)
+
+
 def ensure_image(runtime: str, context: Path) -> bool:
     """Ensure the container image exists and is up-to-date."""
     # Check if image exists
@@ -283,18 +491,26 @@ def ensure_image(runtime: str, context: Path) -> bool:
         print(f"Image {IMAGE_NAME} not found, building...", file=sys.stderr)
         return build_image(runtime, IMAGE_NAME, context)
 
+    # Skip hashing when no trigger file has been touched since the last check
+    trigger_paths = get_trigger_paths(context)
+    signature = get_files_signature(trigger_paths)
+    cache = get_image_cache()
+    if cache.get("hash") and cache.get("sig") == signature:
+        return True
+
     # Calculate current hash of build trigger files
-    trigger_paths = [context / f for f in BUILD_TRIGGER_FILES]
     current_hash = calculate_files_hash(trigger_paths)
-    cached_hash = get_image_hash()
+    cached_hash = cache.get("hash")
 
     if cached_hash != current_hash:
         print(f"Build files changed, rebuilding {IMAGE_NAME}...", file=sys.stderr)
         if build_image(runtime, IMAGE_NAME, context):
-            save_image_hash(current_hash)
+            save_image_hash(current_hash, signature)
             return True
         return False
 
+    # Contents unchanged (e.g. files were only touched); refresh the signature
+    save_image_hash(current_hash, signature)
     return True
 
 
@@ -313,15 +529,27 @@ def get_remote_url(repo_base: Path) -> str:
     """Get the remote URL of the repository."""
     result = subprocess.run(
         ["git", "-C", str(repo_base), "remote", "get-url", "origin"],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
         text=True,
         check=True,
     )
     return result.stdout.strip()
 
 
+def local_branch_exists(repo_base: Path, branch: str) -> bool:
+    """Check whether repo_base has a local branch with the given name."""
+    result = subprocess.run(
+        ["git", "-C", str(repo_base), "rev-parse", "--verify", "--quiet",
+         f"refs/heads/{branch}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return result.returncode == 0
+
+
 def create_work_dir(repo_base: Path, name: str, branch: str) -> Path:
-    """Create a shallow clone of the repository for the sandbox."""
+    """Clone the local branch if it exists, else shallow-clone it from origin."""
     work_base = repo_base / WORK_DIR
     work_base.mkdir(exist_ok=True)
 
@@ -330,18 +558,62 @@ def create_work_dir(repo_base: Path, name: str, branch: str) -> Path:
     # Get remote URL
     remote_url = get_remote_url(repo_base)
 
-    # Shallow clone the specific branch
-    subprocess.run(
-        [
-            "git", "clone",
-            "--depth", "1",
-            "--branch", branch,
-            "--single-branch",
-            remote_url,
-            str(work_path),
-        ],
-        check=True,
-    )
+    local = local_branch_exists(repo_base, branch)
+
+    # Clone the specific branch, retrying stalled or failed clones
+    clone_cmd = ["git", "clone"]
+    if local:
+        # Plain-path local clones hardlink objects; --depth would force a copy
+        source = str(repo_base)
+    else:
+        source = remote_url
+        clone_cmd += ["--depth", "1"]
+    clone_cmd += [
+        "--branch", branch,
+        "--single-branch",
+        "--no-tags",
+        source,
+        str(work_path),
+    ]
+    preexisting = work_path.exists()
+    for attempt in range(1, CLONE_ATTEMPTS + 1):
+        try:
+            subprocess.run(clone_cmd, check=True, timeout=CLONE_TIMEOUT)
+            break
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            timed_out = isinstance(e, subprocess.TimeoutExpired)
+            # git removes its own directory when a clone fails, but a killed
+            # clone leaves a partial checkout; never touch a preexisting one
+            if timed_out and not preexisting:
+                shutil.rmtree(work_path, ignore_errors=True)
+            # A local clone or an occupied destination fails the same way
+            # every time; anything else may be a network hiccup
+            if ((local or preexisting) and not timed_out) or attempt == CLONE_ATTEMPTS:
+                raise
+            delay = 2 ** attempt
+            print(
+                f"Clone attempt {attempt}/{CLONE_ATTEMPTS} failed ({e}), "
+                f"retrying in {delay}s...",
+                file=sys.stderr,
+            )
+            time.sleep(delay)
+
+    if local:
+        try:
+            subprocess.run(
+                ["git", "-C", str(work_path), "remote", "set-url", "origin", remote_url],
+                check=True,
+            )
+            # origin/<branch> still names the local commit; drop it so the
+            # sandbox does not report a bogus upstream until the next fetch
+            subprocess.run(
+                ["git", "-C", str(work_path), "update-ref", "-d",
+                 f"refs/remotes/origin/{branch}"],
+                check=True,
+            )
+        except subprocess.CalledProcessError:
+            shutil.rmtree(work_path, ignore_errors=True)
+            raise
 
     return work_path
 
@@ -354,6 +626,27 @@ def remove_work_dir(repo_base: Path, name: str) -> None:
         shutil.rmtree(work_path)
 
 
+def remove_tree_parallel(path: Path, max_workers: int = RESET_WORKERS) -> None:
+    """Remove a directory tree, deleting its top-level entries concurrently."""
+    # Unlink a symlink rather than emptying its target
+    if path.is_symlink():
+        path.unlink()
+        return
+
+    def remove_entry(entry: os.DirEntry) -> None:
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+
+    with os.scandir(path) as it:
+        entries = list(it)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # list() re-raises the first failure, like shutil.rmtree would
+        list(executor.map(remove_entry, entries))
+    os.rmdir(path)
+
+
 # =============================================================================
 # Container Management
 # =============================================================================
@@ -370,24 +663,64 @@ def get_uid_gid_args(runtime: str) -> list[str]:
     return []
 
 
-def container_exists(runtime: str, container_name: str) -> bool:
+def list_container_states(runtime: str) -> Optional[dict[str, str]]:
+    """Map each sandbox container name to its state, or None if ps fails."""
+    try:
+        result = subprocess.run(
+            [
+                runtime, "ps", "-a",
+                "--filter", f"name={CONTAINER_PREFIX}",
+                "--format", "{{.Names}}\t{{.State}}",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+
+    states = {}
+    for line in result.stdout.splitlines():
+        name, _, state = line.partition("\t")
+        if name:
+            state = state.strip().lower()
+            # Podman before 4.0 prints status text such as "Up 3 hours ago"
+            if state.startswith("up"):
+                state = "running"
+            states[name] = state
+    return states
+
+
+def container_exists(
+    runtime: str, container_name: str, snapshot: Optional[dict[str, str]] = None
+) -> bool:
     """Check if a container exists."""
+    if snapshot is not None:
+        return container_name in snapshot
     try:
         result = subprocess.run(
             [runtime, "container", "inspect", container_name],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
         return result.returncode == 0
     except Exception:
         return False
 
 
-def container_running(runtime: str, container_name: str) -> bool:
+def container_running(
+    runtime: str, container_name: str, snapshot: Optional[dict[str, str]] = None
+) -> bool:
     """Check if a container is running."""
+    if snapshot is not None:
+        return snapshot.get(container_name) == "running"
     try:
         result = subprocess.run(
             [runtime, "container", "inspect", "-f", "{{.State.Running}}", container_name],
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
         )
         return result.returncode == 0 and result.stdout.strip() == "true"
@@ -395,6 +728,26 @@ def container_running(runtime: str, container_name: str) -> bool:
         return False
 
 
+def container_state(
+    runtime: str, container_name: str, snapshot: Optional[dict[str, str]] = None
+) -> tuple[bool, bool]:
+    """Check whether a container exists and whether it is running, in one call."""
+    if snapshot is not None:
+        state = snapshot.get(container_name)
+        return state is not None, state == "running"
+    try:
+        result = subprocess.run(
+            [runtime, "container", "inspect", "-f", "{{.State.Running}}", container_name],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except Exception:
+        return False, False
+    exists = result.returncode == 0
+    return exists, exists and result.stdout.strip() == "true"
+
+
 def start_container(runtime: str, container_name: str) -> bool:
     """Start a stopped container."""
     try:
@@ -407,7 +760,12 @@ def start_container(runtime: str, container_name: str) -> bool:
 def stop_container(runtime: str, container_name: str) -> bool:
     """Stop a running container."""
     try:
-        subprocess.run([runtime, "stop", container_name], check=True, capture_output=True)
+        subprocess.run(
+            [runtime, "stop", container_name],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
         return True
     except subprocess.CalledProcessError:
         return False
@@ -416,12 +774,29 @@ def stop_container(runtime: str, container_name: str) -> bool:
 def remove_container(runtime: str, container_name: str) -> bool:
     """Remove a container."""
     try:
-        subprocess.run([runtime, "rm", "-f", container_name], check=True, capture_output=True)
+        subprocess.run(
+            [runtime, "rm", "-f", container_name],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
         return True
     except subprocess.CalledProcessError:
         return False
 
 
+def get_container_volume_args() -> list[str]:
+    """Get -v arguments for the host credential files that exist."""
+    args = []
+    exists = {}
+    for host_path, container_path in CREDENTIAL_MOUNTS:
+        if host_path not in exists:
+            exists[host_path] = host_path.exists()
+        if exists[host_path]:
+            args.extend(["-v", f"{host_path}:{container_path}:ro"])
+    return args
+
+
 def create_sandbox_container(
     runtime: str,
     container_name: str,
@@ -438,31 +813,7 @@ def create_sandbox_container(
     cmd.extend(["--name", container_name])
 
     # Volume mounts
-    home = Path.home()
-
-    # CCR config
-    ccr_config = home / ".claude-code-router" / "config.json"
-    if ccr_config.exists():
-        cmd.extend(["-v", f"{ccr_config}:/home/agentizer/.claude-code-router/config.json:ro"])
-        cmd.extend(["-v", f"{ccr_config}:/home/agentizer/.claude-code-router/config-router.json:ro"])
-
-    # GitHub CLI credentials
-    gh_config_yml = home / ".config" / "gh" / "config.yml"
-    if gh_config_yml.exists():
-        cmd.extend(["-v", f"{gh_config_yml}:/home/agentizer/.config/gh/config.yml:ro"])
-
-    gh_hosts = home / ".config" / "gh" / "hosts.yml"
-    if gh_hosts.exists():
-        cmd.extend(["-v", f"{gh_hosts}:/home/agentizer/.config/gh/hosts.yml:ro"])
-
-    # Git credentials
-    git_creds = home / ".git-credentials"
-    if git_creds.exists():
-        cmd.extend(["-v", f"{git_creds}:/home/agentizer/.git-credentials:ro"])
-
-    git_config = home / ".gitconfig"
-    if git_config.exists():
-        cmd.extend(["-v", f"{git_config}:/home/agentizer/.gitconfig:ro"])
+    cmd.extend(get_container_volume_args())
 
     # Worktree directory
     cmd.extend(["-v", f"{worktree_path}:/workspace"])
@@ -489,7 +840,8 @@ def create_sandbox_container(
 
     # Run container
     result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-    return result.stdout.strip()
+    matches = CONTAINER_ID_RE.findall(result.stdout)
+    return matches[-1] if matches else result.stdout.strip()
 
 
 # =============================================================================
@@ -499,20 +851,18 @@ def create_sandbox_container(
 
 def cmd_new(args) -> int:
     """Handle 'new' subcommand: Create new worktree + container."""
-    repo_base = Path(args.repo_base).resolve()
+    repo_base = Path(args.repo_base)
     runtime = get_container_runtime()
 
-    # Validate git repo
-    if not validate_git_repo(repo_base):
-        print(f"Error: {repo_base} is not a git repository", file=sys.stderr)
-        return 1
-
     db = SandboxDB(repo_base)
 
     # Auto-generate name if not provided
     name = args.name
     if not name:
         counter = db.get_next_counter()
+        # Skip work directories left behind without a database record
+        while (repo_base / WORK_DIR / f"cnt_{counter}").exists():
+            counter += 1
         name = f"cnt_{counter}"
 
     # Check for name conflicts
@@ -520,89 +870,119 @@ def cmd_new(args) -> int:
         print(f"Error: Sandbox '{name}' already exists", file=sys.stderr)
         return 1
 
-    # Ensure image exists
-    script_dir = Path(__file__).parent.resolve()
-    if not ensure_image(runtime, script_dir):
-        print("Failed to ensure container image", file=sys.stderr)
-        return 1
-
     print(f"Creating sandbox '{name}' on branch '{args.branch}'...")
 
-    # Create work directory (shallow clone)
+    # Anything that fails before the database record exists must not leave
+    # a work directory or container behind, or later auto-naming collides
+    container_name = get_container_name(name)
+    preexisting = (repo_base / WORK_DIR / name).exists()
+    container_started = False
     try:
-        work_path = create_work_dir(repo_base, name, args.branch)
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to create work directory: {e}", file=sys.stderr)
-        return 1
+        # Ensuring the image and cloning the work directory are independent,
+        # so run them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            image_future = executor.submit(ensure_image, runtime, SCRIPT_DIR)
+            work_future = executor.submit(create_work_dir, repo_base, name, args.branch)
+            try:
+                work_path = work_future.result()
+                work_error = None
+            except subprocess.SubprocessError as e:
+                work_error = e
+            image_ok = image_future.result()
+
+        if work_error:
+            print(f"Failed to create work directory: {work_error}", file=sys.stderr)
+            return 1
 
-    # Record in database
-    db.create(name, args.branch, str(work_path), args.ccr)
+        if not image_ok:
+            print("Failed to ensure container image", file=sys.stderr)
+            remove_work_dir(repo_base, name)
+            return 1
 
-    # Create container
-    container_name = get_container_name(name)
-    try:
-        container_id = create_sandbox_container(
-            runtime, container_name, work_path, args.ccr
-        )
-        db.update_container_id(name, container_id)
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to create container: {e}", file=sys.stderr)
-        # Cleanup work directory on failure
-        remove_work_dir(repo_base, name)
-        db.delete(name)
-        return 1
+        # Create container
+        container_started = True
+        try:
+            container_id = create_sandbox_container(
+                runtime, container_name, work_path, args.ccr
+            )
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to create container: {e}", file=sys.stderr)
+            # Cleanup work directory on failure
+            remove_work_dir(repo_base, name)
+            return 1
 
-    print(f"Sandbox '{name}' created successfully")
-    print(f"  Work dir: {work_path}")
-    print(f"  Container: {container_name}")
-    print(f"  Attach with: run.py attach -n {name}")
+        # Record in database once the container exists (single commit)
+        db.create(
+            name,
+            args.branch,
+            str(work_path),
+            args.ccr,
+            container_id=container_id,
+            container_name=container_name,
+            state="running",
+        )
+    except BaseException:
+        if container_started:
+            remove_container(runtime, container_name)
+        if not preexisting:
+            remove_work_dir(repo_base, name)
+        raise
+
+    print(
+        f"Sandbox '{name}' created successfully\n"
+        f"  Work dir: {work_path}\n"
+        f"  Container: {container_name}\n"
+        f"  Attach with: run.py attach -n {name}"
+    )
     return 0
 
 
 def cmd_ls(args) -> int:
     """Handle 'ls' subcommand: List all sandboxes."""
-    repo_base = Path(args.repo_base).resolve()
+    repo_base = Path(args.repo_base)
     runtime = get_container_runtime()
 
-    if not validate_git_repo(repo_base):
-        print(f"Error: {repo_base} is not a git repository", file=sys.stderr)
-        return 1
-
     db = SandboxDB(repo_base)
+
+    if args.json:
+        print(db.list_all_json())
+        return 0
+
     sandboxes = db.list_all()
 
     if not sandboxes:
         print("No sandboxes found")
         return 0
 
-    # Print header
-    print(f"{'NAME':<15} {'BRANCH':<20} {'CONTAINER':<12} {'STATUS':<10} {'CREATED'}")
-    print("-" * 80)
+    # Header
+    rows = [LS_ROW_FORMAT("NAME", "BRANCH", "CONTAINER", "STATUS", "CREATED"), "-" * 80]
+
+    # One ps call for all rows instead of two inspects per sandbox
+    snapshot = list_container_states(runtime)
 
     for sb in sandboxes:
-        container_name = get_container_name(sb["name"])
-        if container_running(runtime, container_name):
+        container_name = sb["container_name"] or get_container_name(sb["name"])
+        exists, running = container_state(runtime, container_name, snapshot)
+        if running:
             status = "running"
-        elif container_exists(runtime, container_name):
+        elif exists:
             status = "stopped"
         else:
             status = "no container"
 
         created = sb["created_at"][:16] if sb["created_at"] else "unknown"
-        print(f"{sb['name']:<15} {sb['branch']:<20} {container_name:<12} {status:<10} {created}")
+        rows.append(LS_ROW_FORMAT(sb["name"], sb["branch"], container_name, status, created))
 
+    # Emit the whole table with a single write
+    sys.stdout.write("\n".join(rows) + "\n")
     return 0
 
 
 def cmd_rm(args) -> int:
     """Handle 'rm' subcommand: Delete worktree + container."""
-    repo_base = Path(args.repo_base).resolve()
+    repo_base = Path(args.repo_base)
     runtime = get_container_runtime()
 
-    if not validate_git_repo(repo_base):
-        print(f"Error: {repo_base} is not a git repository", file=sys.stderr)
-        return 1
-
     db = SandboxDB(repo_base)
     sandbox = db.get(args.name)
 
@@ -610,7 +990,7 @@ def cmd_rm(args) -> int:
         print(f"Error: Sandbox '{args.name}' not found", file=sys.stderr)
         return 1
 
-    container_name = get_container_name(args.name)
+    container_name = sandbox["container_name"] or get_container_name(sandbox["name"])
     print(f"Removing sandbox '{args.name}'...")
 
     # Stop and remove container
@@ -634,13 +1014,9 @@ def cmd_rm(args) -> int:
 
 def cmd_attach(args) -> int:
     """Handle 'attach' subcommand: Attach to tmux session."""
-    repo_base = Path(args.repo_base).resolve()
+    repo_base = Path(args.repo_base)
     runtime = get_container_runtime()
 
-    if not validate_git_repo(repo_base):
-        print(f"Error: {repo_base} is not a git repository", file=sys.stderr)
-        return 1
-
     db = SandboxDB(repo_base)
     sandbox = db.get(args.name)
 
@@ -648,66 +1024,103 @@ def cmd_attach(args) -> int:
         print(f"Error: Sandbox '{args.name}' not found", file=sys.stderr)
         return 1
 
-    container_name = get_container_name(args.name)
+    container_name = sandbox["container_name"] or get_container_name(sandbox["name"])
+
+    # Attach to tmux session using the fixed socket path
+    # Use -u 0 (root) because podman rootless maps container UID to different host UID,
+    # causing socket permission issues when accessing from exec
+    socket_path = "/tmp/tmux-main"
+    cmd = [
+        runtime, "exec", "-it", "-u", "0",
+        container_name, "tmux", "-S", socket_path, "attach", "-t", "main"
+    ]
+
+    # Fast path: trust the last known state and attach without probing.
+    # Only if the attach fails do we inspect, to tell a stale state apart
+    # from an error inside the session.
+    probed = None
+    if sandbox["state"] == "running":
+        print(f"Attaching to sandbox '{args.name}'...")
+        returncode = subprocess.run(cmd).returncode
+        if returncode == 0:
+            return 0
+        probed = container_state(runtime, container_name)
+        if probed[1]:
+            return returncode
+        db.update_state(args.name, "stopped" if probed[0] else "unknown")
+        if probed[0]:
+            print(f"Container '{container_name}' is not running, starting...")
 
     # Check container state
-    if not container_exists(runtime, container_name):
+    exists, running = probed or container_state(runtime, container_name)
+    if not exists:
         print(f"Error: Container '{container_name}' does not exist", file=sys.stderr)
         return 1
 
     # Start container if stopped
-    if not container_running(runtime, container_name):
-        print(f"Starting container '{container_name}'...")
+    if not running:
+        if not probed:
+            print(f"Starting container '{container_name}'...")
         if not start_container(runtime, container_name):
             print(f"Failed to start container", file=sys.stderr)
+            db.update_state(args.name, "unknown")
             return 1
+    db.update_state(args.name, "running")
 
-    # Attach to tmux session using the fixed socket path
-    # Use -u 0 (root) because podman rootless maps container UID to different host UID,
-    # causing socket permission issues when accessing from exec
-    socket_path = "/tmp/tmux-main"
-    cmd = [
-        runtime, "exec", "-it", "-u", "0",
-        container_name, "tmux", "-S", socket_path, "attach", "-t", "main"
-    ]
     print(f"Attaching to sandbox '{args.name}'...")
     os.execvp(cmd[0], cmd)
 
 
 def cmd_reset(args) -> int:
     """Handle 'reset' subcommand: Remove all work directories and sandbox images."""
-    repo_base = Path(args.repo_base).resolve()
+    repo_base = Path(args.repo_base)
     runtime = get_container_runtime()
 
-    if not validate_git_repo(repo_base):
-        print(f"Error: {repo_base} is not a git repository", file=sys.stderr)
-        return 1
-
     print(f"Resetting all sandbox resources for {repo_base}...")
 
     # Get all sandboxes from database
     db = SandboxDB(repo_base)
     sandboxes = db.list_all()
 
-    # Stop and remove all containers
+    # Stop and remove all containers, using one ps call for the existence scan
+    snapshot = list_container_states(runtime)
+    running_by_name = {}
     for sb in sandboxes:
-        container_name = get_container_name(sb["name"])
-        if container_exists(runtime, container_name):
-            print(f"  Stopping and removing container '{container_name}'...")
+        container_name = sb["container_name"] or get_container_name(sb["name"])
+        exists, running = container_state(runtime, container_name, snapshot)
+        if exists:
+            running_by_name[container_name] = running
+    container_names = list(running_by_name)
+
+    def teardown(container_name: str) -> bool:
+        if running_by_name[container_name]:
             stop_container(runtime, container_name)
-            remove_container(runtime, container_name)
+        return remove_container(runtime, container_name)
+
+    for container_name in container_names:
+        print(f"  Stopping and removing container '{container_name}'...")
+
+    # Teardowns are independent and wait on the runtime, so run them concurrently
+    with ThreadPoolExecutor(max_workers=RESET_WORKERS) as executor:
+        results = list(executor.map(teardown, container_names))
+    for container_name, removed in zip(container_names, results):
+        if not removed:
+            print(f"  Warning: Failed to remove container '{container_name}'", file=sys.stderr)
 
     # Remove the entire .work directory
     work_base = repo_base / WORK_DIR
     if work_base.exists():
         print(f"  Removing work directory '{work_base}'...")
-        shutil.rmtree(work_base)
+        remove_tree_parallel(work_base)
 
     # Remove database file
+    db.close()
     db_path = repo_base / DB_FILE
     if db_path.exists():
         print(f"  Removing database '{db_path}'...")
         db_path.unlink()
+    for suffix in ("-wal", "-shm"):
+        db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
 
     # Remove sandbox image
     if image_exists(runtime, IMAGE_NAME):
@@ -716,15 +1129,19 @@ def cmd_reset(args) -> int:
             subprocess.run(
                 [runtime, "rmi", "-f", IMAGE_NAME],
                 check=True,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
             )
+            image_exists.cache_clear()
         except subprocess.CalledProcessError as e:
             print(f"  Warning: Failed to remove image: {e}", file=sys.stderr)
 
     # Clear image hash cache
-    if CACHE_FILE.exists():
+    if CACHE_FILE.exists() or LEGACY_CACHE_FILE.exists():
         print(f"  Removing image cache...")
-        CACHE_FILE.unlink()
+        CACHE_FILE.unlink(missing_ok=True)
+        LEGACY_CACHE_FILE.unlink(missing_ok=True)
+        get_image_cache.cache_clear()
 
     print("Reset complete.")
     return 0
@@ -756,7 +1173,8 @@ def main():
     new_parser.add_argument("--ccr", action="store_true", help="Run in CCR mode")
 
     # 'ls' subcommand
-    subparsers.add_parser("ls", help="List all sandboxes")
+    ls_parser = subparsers.add_parser("ls", help="List all sandboxes")
+    ls_parser.add_argument("--json", action="store_true", help="Print sandbox records as JSON")
 
     # 'rm' subcommand
     rm_parser = subparsers.add_parser("rm", help="Delete worktree + container")
@@ -776,6 +1194,13 @@ def main():
         parser.print_help()
         sys.exit(1)
 
+    # Resolve and validate the repository once for every subcommand
+    repo_base = Path(args.repo_base).resolve()
+    if not validate_git_repo(repo_base):
+        print(f"Error: {repo_base} is not a git repository", file=sys.stderr)
+        sys.exit(1)
+    args.repo_base = str(repo_base)
+
     # Route to subcommand handler
     handlers = {
         "new": cmd_new,
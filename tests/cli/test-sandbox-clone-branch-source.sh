@@ -0,0 +1,78 @@
+#!/usr/bin/env bash
+# Test: sandbox create_work_dir clones local branches from the repo and others from origin
+
+source "$(dirname "$0")/../common.sh"
+
+SANDBOX_DIR="$PROJECT_ROOT/sandbox"
+
+test_info "sandbox clone branch source tests"
+
+TMP_DIR=$(make_temp_dir "sandbox-clone-branch-source")
+UPSTREAM="$TMP_DIR/upstream"
+REPO="$TMP_DIR/repo"
+
+clean_git_env
+export GIT_AUTHOR_NAME="Test" GIT_AUTHOR_EMAIL="test@example.com"
+export GIT_COMMITTER_NAME="Test" GIT_COMMITTER_EMAIL="test@example.com"
+
+# Upstream with main plus a branch that is never checked out locally
+git init -q -b main "$UPSTREAM"
+git -C "$UPSTREAM" commit -q --allow-empty -m "first"
+git -C "$UPSTREAM" commit -q --allow-empty -m "second"
+git -C "$UPSTREAM" branch remote-only
+
+# file:// so the remote clone is a real (shallow) transport clone
+git clone -q "file://$UPSTREAM" "$REPO"
+git -C "$REPO" commit -q --allow-empty -m "unpushed"
+LOCAL_HEAD=$(git -C "$REPO" rev-parse main)
+
+create_work_dir() {
+    PYTHONDONTWRITEBYTECODE=1 python3 - "$REPO" "$1" "$2" <<EOF
+import sys
+from pathlib import Path
+
+sys.path.insert(0, "$SANDBOX_DIR")
+from run import create_work_dir
+
+print(create_work_dir(Path(sys.argv[1]), sys.argv[2], sys.argv[3]))
+EOF
+}
+
+# Test 1: A local branch is cloned from the repo, including unpushed commits
+test_info "Test 1: local branch → cloned from repo_base"
+WORK=$(create_work_dir local-sb main 2>/dev/null)
+[ "$WORK" = "$REPO/.work/local-sb" ] || test_fail "Unexpected work dir '$WORK'"
+
+HEAD=$(git -C "$WORK" rev-parse HEAD)
+[ "$HEAD" = "$LOCAL_HEAD" ] || test_fail "Expected HEAD=$LOCAL_HEAD (local main), got $HEAD"
+
+ORIGIN=$(git -C "$WORK" remote get-url origin)
+[ "$ORIGIN" = "file://$UPSTREAM" ] || test_fail "Expected origin=file://$UPSTREAM, got '$ORIGIN'"
+
+if git -C "$WORK" rev-parse --verify --quiet refs/remotes/origin/main >/dev/null; then
+    test_fail "origin/main should not point at the local commit"
+fi
+
+# Test 2: A branch missing locally is shallow-cloned from origin
+test_info "Test 2: remote-only branch → shallow clone of origin"
+WORK=$(create_work_dir remote-sb remote-only 2>/dev/null)
+
+BRANCH=$(git -C "$WORK" rev-parse --abbrev-ref HEAD)
+[ "$BRANCH" = "remote-only" ] || test_fail "Expected branch remote-only, got '$BRANCH'"
+
+SHALLOW=$(git -C "$WORK" rev-parse --is-shallow-repository)
+[ "$SHALLOW" = "true" ] || test_fail "Expected a shallow clone of origin"
+
+# Test 3: A failed local clone leaves an existing directory untouched
+test_info "Test 3: occupied destination → error, files kept"
+mkdir -p "$REPO/.work/occupied"
+echo "keep" > "$REPO/.work/occupied/file"
+if create_work_dir occupied main >/dev/null 2>&1; then
+    test_fail "Cloning into a non-empty directory should fail"
+fi
+[ -f "$REPO/.work/occupied/file" ] || test_fail "Existing work dir contents were removed"
+
+# Cleanup
+cleanup_dir "$TMP_DIR"
+
+test_pass "sandbox clones local branches from the repo and others from origin"
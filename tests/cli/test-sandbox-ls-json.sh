@@ -0,0 +1,53 @@
+#!/usr/bin/env bash
+# Test: sandbox run.py ls --json prints the stored records as a JSON array
+
+source "$(dirname "$0")/../common.sh"
+
+RUN_PY="$PROJECT_ROOT/sandbox/run.py"
+
+test_info "sandbox ls --json tests"
+
+TMP_DIR=$(make_temp_dir "sandbox-ls-json")
+REPO="$TMP_DIR/repo"
+
+clean_git_env
+git init -q "$REPO"
+
+# Test 1: An empty database prints an empty array
+test_info "Test 1: no sandboxes → []"
+OUTPUT=$(python3 "$RUN_PY" --repo_base "$REPO" ls --json)
+[ "$OUTPUT" = "[]" ] || test_fail "Expected '[]', got '$OUTPUT'"
+
+# Test 2: Records are listed newest first
+test_info "Test 2: records ordered by created_at, newest first"
+python3 - "$REPO/.sandbox_db.sqlite" <<'EOF'
+import sqlite3
+import sys
+
+conn = sqlite3.connect(sys.argv[1])
+conn.executemany(
+    "INSERT INTO sandboxes (name, branch, work_dir, created_at) VALUES (?, ?, ?, ?)",
+    [
+        ("older", "main", "/w/older", "2024-01-01 00:00:00"),
+        ("newest", "dev", "/w/newest", "2024-03-01 00:00:00"),
+        ("middle", "main", "/w/middle", "2024-02-01 00:00:00"),
+    ],
+)
+conn.commit()
+EOF
+
+OUTPUT=$(python3 "$RUN_PY" --repo_base "$REPO" ls --json)
+NAMES=$(echo "$OUTPUT" | jq -r '[.[].name] | join(",")')
+[ "$NAMES" = "newest,middle,older" ] || test_fail "Expected 'newest,middle,older', got '$NAMES'"
+
+BRANCH=$(echo "$OUTPUT" | jq -r '.[0].branch')
+[ "$BRANCH" = "dev" ] || test_fail "Expected branch=dev for newest, got '$BRANCH'"
+
+# Rows without a stored container name fall back to the derived one
+CONTAINER=$(echo "$OUTPUT" | jq -r '.[0].container_name')
+[ "$CONTAINER" = "agentize-sb-newest" ] || test_fail "Expected container_name=agentize-sb-newest, got '$CONTAINER'"
+
+# Cleanup
+cleanup_dir "$TMP_DIR"
+
+test_pass "sandbox ls --json prints stored records in order"